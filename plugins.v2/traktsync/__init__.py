@@ -2,6 +2,7 @@ import datetime
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from threading import Lock, Thread
 from typing import Optional, Any, List, Dict, Tuple
@@ -39,7 +40,7 @@ class TraktSync(_PluginBase):
 
     plugin_author = "cyt-666"
 
-    plugin_version = "0.1.8"
+    plugin_version = "0.2.2"
 
     author_url = "https://github.com/cyt-666"
 
@@ -59,9 +60,34 @@ class TraktSync(_PluginBase):
 
     _watchlist_url = "https://api.trakt.tv/sync/watchlist"
 
+    _progress_url = "https://api.trakt.tv/shows/{id}/progress/watched"
+
+    _calendar_url = "https://api.trakt.tv/calendars/my/shows"
+
+    # 拉取日历的天数
+    _calendar_days = 7
+
+    # 按日历检查时watch list同步间隔（小时），代替执行周期
+    _calendar_sync_interval = 6
+
+    # 同步失败重试：最大次数、初始间隔（秒）、最大间隔（秒）
+    _retry_max_attempts = 5
+
+    _retry_base_interval = 300
+
+    _retry_max_interval = 6 * 3600
+
+    # 观看进度未变化时，已同步剧集重新检查缺失季的间隔（秒）
+    _progress_recheck_interval = 24 * 3600
+
+    # 新增订阅立即搜索的并发数
+    _search_workers = 2
 
 
     _scheduler: Optional[BackgroundScheduler] = None
+    _search_executor: Optional[ThreadPoolExecutor] = None
+    # 正在搜索的(tmdbid, 季)
+    _searching: set = set()
     _cache_path: Optional[Path] = None
     downloadchain = None
     searchchain = None
@@ -71,6 +97,9 @@ class TraktSync(_PluginBase):
 
     token:dict = {}
 
+    # 单次同步内的观看进度缓存
+    _progress_cache: dict = {}
+
 
      # 配置属性
     _enabled: bool = False
@@ -83,6 +112,15 @@ class TraktSync(_PluginBase):
 
     _media_type: str = ""
 
+    _watch_progress: bool = False
+    _seasons_ahead: int = 0
+
+    _calendar: bool = False
+    _calendar_delay: int = 60
+
+    _search_now: bool = False
+    _search_limit: int = 10
+
     def _threaded_token_request(self, device_code: str, interval: int, count: int):
         """
         在单独的线程中请求 Trakt token。
@@ -110,6 +148,24 @@ class TraktSync(_PluginBase):
             self._cron = config.get("cron")
             self._notify = config.get("notify")
             self._media_type = config.get("media_type")
+            self._watch_progress = config.get("watch_progress")
+            try:
+                self._seasons_ahead = int(config.get("seasons_ahead") or 0)
+            except ValueError:
+                self._seasons_ahead = 0
+            self._calendar = config.get("calendar")
+            try:
+                self._calendar_delay = int(config.get("calendar_delay") or 60)
+            except ValueError:
+                self._calendar_delay = 60
+            if self._calendar_delay < 0:
+                logger.error(f"播出后延迟不能为负数：{self._calendar_delay}，使用默认值60分钟")
+                self._calendar_delay = 60
+            self._search_now = config.get("search_now")
+            try:
+                self._search_limit = max(int(config.get("search_limit") or 10), 1)
+            except ValueError:
+                self._search_limit = 10
             self._client_id = config.get("client_id")
             self._client_secret = config.get("client_secret")
 
@@ -138,19 +194,30 @@ class TraktSync(_PluginBase):
                 token_thread.start()
                 logger.info("Trakt token acquisition started in a separate thread.")
 
+            self._searching = set()
+            if self._search_now:
+                self._search_executor = ThreadPoolExecutor(max_workers=self._search_workers,
+                                                           thread_name_prefix="traktsync-search")
+
             if self._enabled or self._onlyonce:
+                self._scheduler = BackgroundScheduler(timezone=settings.TZ)
                 if self._onlyonce:
-                    self._scheduler = BackgroundScheduler(timezone=settings.TZ)
                     logger.info(f"Trakt Watchlist Sync服务启动，立即运行一次")
                     self._scheduler.add_job(func=self.sync_watchlist, trigger='date',
                                             run_date=datetime.datetime.now(
                                                 tz=pytz.timezone(settings.TZ)) + datetime.timedelta(seconds=3)
                                             )
+                if self._enabled and self._calendar:
+                    # 启动后拉取一次日历并安排检查任务
+                    self._scheduler.add_job(func=self.refresh_calendar, trigger='date',
+                                            run_date=datetime.datetime.now(
+                                                tz=pytz.timezone(settings.TZ)) + datetime.timedelta(seconds=10)
+                                            )
 
-                    # 启动任务
-                    if self._scheduler.get_jobs():
-                        self._scheduler.print_jobs()
-                        self._scheduler.start()
+                # 启动任务
+                if self._scheduler.get_jobs():
+                    self._scheduler.print_jobs()
+                    self._scheduler.start()
 
                 if self._onlyonce:
                     # 关闭一次性开关
@@ -168,6 +235,12 @@ class TraktSync(_PluginBase):
             "onlyonce": self._onlyonce,
             "cron": self._cron,
             "media_type": self._media_type,
+            "watch_progress": self._watch_progress,
+            "seasons_ahead": self._seasons_ahead,
+            "calendar": self._calendar,
+            "calendar_delay": self._calendar_delay,
+            "search_now": self._search_now,
+            "search_limit": self._search_limit,
             "client_id": self._client_id,
             "client_secret": self._client_secret
         })  
@@ -448,6 +521,123 @@ class TraktSync(_PluginBase):
                             }
                         ]
                     },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'watch_progress',
+                                            'label': '按观看进度订阅剧集',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'seasons_ahead',
+                                            'label': '订阅季数',
+                                            'type': 'number',
+                                            'placeholder': '从未看完的季起订阅的季数，0为全部后续季'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'calendar',
+                                            'label': '按Trakt日历检查新剧集（开启后每6小时同步watch list，忽略执行周期）',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'calendar_delay',
+                                            'label': '播出后延迟（分钟）',
+                                            'type': 'number',
+                                            'placeholder': '剧集播出后多久搜索订阅'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'search_now',
+                                            'label': '新增订阅立即搜索',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'search_limit',
+                                            'label': '每次最多搜索数',
+                                            'type': 'number',
+                                            'placeholder': '超出的订阅等待订阅定时搜索'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
                     {
                         'component': 'VRow',
                         'content': [
@@ -495,6 +685,12 @@ class TraktSync(_PluginBase):
             "onlyonce": False,
             "cron": "*/30 * * * *",
             "media_type": "all",
+            "watch_progress": False,
+            "seasons_ahead": 0,
+            "calendar": False,
+            "calendar_delay": 60,
+            "search_now": False,
+            "search_limit": 10,
             "client_id": "",
             "client_secret": ""
         }
@@ -576,49 +772,373 @@ class TraktSync(_PluginBase):
             return None
     
 
-    def sync_watchlist(self):
+    def get_watched_progress(self, access_token: str, trakt_id: int) -> dict:
+        """
+        获取剧集的观看进度，单次同步内缓存
+        """
+        if trakt_id in self._progress_cache:
+            return self._progress_cache[trakt_id]
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+            "trakt-api-version": "2",
+            "trakt-api-key": self._client_id,
+        }
+        url = self._progress_url.format(id=trakt_id)
+        try:
+            response = requests.get(url, headers=headers)
+            response.raise_for_status()
+            progress = json.loads(response.text)
+        except Exception as e:
+            logger.error(f"Trakt get watched progress failed: {e}")
+            return None
+        self._progress_cache[trakt_id] = progress
+        return progress
+
+    def __progress_seasons(self, access_token: str, trakt_media_info: dict) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        根据观看进度计算需要订阅的季范围
+        :return: 起始季，结束季（不含，None为不限）；获取进度失败时返回None
+        """
+        progress = self.get_watched_progress(access_token, trakt_media_info.get("ids").get("trakt"))
+        if progress is None:
+            return None
+        next_episode = progress.get("next_episode")
+        if next_episode:
+            begin = next_episode.get("season")
+        else:
+            # 已看完全部已播出剧集，只订阅之后的新季
+            begin = max([s.get("number") for s in progress.get("seasons") or []] or [0]) + 1
+        end = begin + self._seasons_ahead if self._seasons_ahead > 0 else None
+        return begin, end
+
+    def get_calendar(self, access_token: str) -> list:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+            "trakt-api-version": "2",
+            "trakt-api-key": self._client_id,
+        }
+        start_date = datetime.datetime.now(tz=pytz.utc).strftime("%Y-%m-%d")
+        url = f"{self._calendar_url}/{start_date}/{self._calendar_days}"
+        try:
+            response = requests.get(url, headers=headers)
+            response.raise_for_status()
+            return json.loads(response.text)
+        except Exception as e:
+            logger.error(f"Trakt get calendar failed: {e}")
+            return None
+
+    def __get_access_token(self) -> Optional[str]:
         token = self.get_data("token")
         if not token:
             logger.error("Trakt token not found")
-            return
+            return None
         if token.get("expired_at") < time.time():
             token = self.refresh_token_request(token.get("refresh_token"))
         if not token:
             logger.error("Trakt token refresh failed")
+            return None
+        return token.get("access_token")
+
+    def refresh_calendar(self):
+        """
+        拉取Trakt日历并缓存，为watch list中的剧集在播出后安排单剧检查
+        """
+        calendar = None
+        access_token = self.__get_access_token()
+        if access_token:
+            calendar = self.get_calendar(access_token)
+        if calendar is None:
+            # 拉取失败时使用缓存的日历
+            entries = self.get_data("calendar") or []
+        else:
+            entries = []
+            for c in calendar:
+                show = c.get("show") or {}
+                episode = c.get("episode") or {}
+                if not c.get("first_aired") or not show.get("ids", {}).get("tmdb"):
+                    continue
+                entries.append({
+                    "show": show,
+                    "tmdbid": show.get("ids").get("tmdb"),
+                    "season": episode.get("season"),
+                    "episode": episode.get("number"),
+                    "first_aired": c.get("first_aired")
+                })
+            self.save_data("calendar", entries)
+        if not self._scheduler:
             return
-        watchlist = self.get_watchlist(token.get("access_token"))
-        logger.info(f"Trakt get watchlist: {[w.get('id') for w in watchlist]}")
-        if not watchlist:
+        for job in self._scheduler.get_jobs():
+            if job.id.startswith("traktsync_calendar_"):
+                job.remove()
+        # 只检查watch list中同步过的或由本插件订阅的剧集
+        # 电影与剧集的TMDB ID可能重复，只取剧集
+        tmdbids = [h.get("tmdbid") for h in (self.get_data("history") or {}).values()
+                   if h.get("type") == MediaType.TV.value]
+        tmdbids += [s.tmdbid for s in self.subscribechain.subscribeoper.list()
+                    if s.username == "trakt_sync" and s.type == MediaType.TV.value]
+        now = datetime.datetime.now(tz=pytz.utc)
+        for entry in entries:
+            if entry.get("tmdbid") not in tmdbids:
+                continue
+            try:
+                aired = datetime.datetime.strptime(entry.get("first_aired"),
+                                                   "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=pytz.utc)
+            except ValueError:
+                continue
+            run_date = aired + datetime.timedelta(minutes=self._calendar_delay)
+            if run_date < now:
+                continue
+            # 同一季同时播出的多集只检查一次
+            job_id = f"traktsync_calendar_{entry.get('tmdbid')}_{entry.get('season')}_{int(run_date.timestamp())}"
+            if self._scheduler.get_job(job_id):
+                continue
+            self._scheduler.add_job(func=self.check_airing, trigger='date', run_date=run_date,
+                                    id=job_id, kwargs={"entry": entry})
+            logger.info(f'{entry.get("show").get("title")} 第{entry.get("season")}季第{entry.get("episode")}集 '
+                        f'将于 {run_date.astimezone(pytz.timezone(settings.TZ)).strftime("%Y-%m-%d %H:%M:%S")} 检查')
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    def check_airing(self, entry: dict):
+        """
+        剧集播出后检查单部剧集，立即搜索该季已有的订阅
+        """
+        tmdbid = entry.get("tmdbid")
+        season = entry.get("season")
+        title = entry.get("show").get("title")
+        try:
+            # 只搜索已有订阅，是否订阅该季由watch list同步按季规则决定
+            subscribes = [s for s in self.subscribechain.subscribeoper.list()
+                          if s.tmdbid == tmdbid and s.season == season]
+            if not subscribes:
+                logger.info(f'{title} 第{season}季 没有订阅，跳过')
+                return
+            key = (tmdbid, season)
+            for subscribe in subscribes:
+                # 与新增订阅立即搜索共用去重，同一季不同时搜索
+                with lock:
+                    if key in self._searching:
+                        logger.info(f'{title} 第{season}季 正在搜索中，跳过')
+                        continue
+                    self._searching.add(key)
+                logger.info(f'{title} 第{season}季第{entry.get("episode")}集 已播出，开始搜索订阅')
+                if self._search_executor:
+                    self._search_executor.submit(self.__search_subscribe, subscribe.id, key)
+                else:
+                    self.__search_subscribe(subscribe.id, key)
+        except Exception as e:
+            logger.error(f'{title} 第{season}季 播出检查出错：{e}')
+
+    def sync_watchlist(self):
+        access_token = self.__get_access_token()
+        if not access_token:
+            return
+        self._progress_cache = {}
+        history = self.get_data("history") or {}
+        retries = self.get_data("retry") or {}
+        new_subscribes = []
+        watchlist = self.get_watchlist(access_token)
+        if watchlist is None:
             logger.error("Trakt get watchlist failed")
+            # 拉取失败时仍处理到期的重试项
+            items = []
+        else:
+            logger.info(f"Trakt get watchlist: {[w.get('id') for w in watchlist]}")
+            items = watchlist
+            # 已从watch list中移除的条目不再重试
+            watch_ids = [str(w.get("id")) for w in watchlist]
+            for key in list(retries.keys()):
+                if key not in watch_ids:
+                    logger.info(f'{retries[key].get("title")} 已不在watch list中，移出重试队列')
+                    retries.pop(key)
+        queued_ids = [str(item.get("id")) for item in items]
+        items = items + [r.get("item") for key, r in retries.items() if key not in queued_ids]
+        now = time.time()
+        for item in items:
+            key = str(item.get("id"))
+            # 按观看进度订阅时，剧集每次都要根据最新进度重新检查
+            if key in history.keys() and not (self._watch_progress and item.get("type") == "show"):
+                logger.info(f'{self.__item_title(item)} 已经同步过，直接跳过')
+                retries.pop(key, None)
+                continue
+            if key in retries.keys():
+                # 已放弃的条目保留在重试队列中，直到从watch list中移除
+                if retries[key].get("given_up") or retries[key].get("next_time") > now:
+                    continue
+            elif key in history.keys() and not self.__progress_changed(access_token, item, history[key]):
+                logger.info(f'{self.__item_title(item)} 观看进度未变化，跳过')
+                continue
+            try:
+                success, record = self.__sync_item(item, access_token, new_subscribes)
+            except Exception as e:
+                logger.error(f'{self.__item_title(item)} 同步出错：{e}')
+                success, record = False, None
+            if success:
+                retries.pop(key, None)
+                if record:
+                    # 重新检查的剧集只在新增了订阅时更新历史记录，否则只更新进度
+                    if key not in history.keys() or record.get("action") == "subscribe":
+                        history[key] = record
+                    else:
+                        history[key]["progress_begin"] = record.get("progress_begin")
+                        history[key]["progress_time"] = record.get("progress_time")
+                    self.save_data("history", history)
+            else:
+                # 已同步剧集的重新检查失败不放弃，否则订阅范围不会再随进度前进
+                self.__add_retry(retries, key, item, give_up=key not in history.keys())
+        self.save_data("retry", retries)
+        self.__search_subscribes(new_subscribes)
+
+    def __search_subscribes(self, new_subscribes: list):
+        """
+        将本次新增的订阅交给线程池立即搜索，每次最多search_limit个，同一(tmdbid, 季)不重复搜索
+        """
+        if not self._search_now or not self._search_executor or not new_subscribes:
             return
-        history = self.get_data("history")
-        for item in watchlist:
-            not_in_no_exists = True
+        queued = 0
+        with lock:
+            for sub_id, tmdbid, season in new_subscribes:
+                key = (tmdbid, season)
+                if key in self._searching:
+                    continue
+                if queued >= self._search_limit:
+                    logger.info(f'本次已提交{queued}个订阅搜索，其余订阅等待订阅定时搜索')
+                    break
+                self._searching.add(key)
+                self._search_executor.submit(self.__search_subscribe, sub_id, key)
+                queued += 1
+
+    def __search_subscribe(self, sub_id: int, key: tuple):
+        try:
+            logger.info(f'开始搜索新增订阅 {sub_id}')
+            self.subscribechain.search(sid=sub_id)
+        except Exception as e:
+            logger.error(f'搜索订阅 {sub_id} 出错：{e}')
+        finally:
+            with lock:
+                self._searching.discard(key)
+
+    def __progress_changed(self, access_token: str, item: dict, record: dict) -> bool:
+        """
+        已同步剧集是否需要重新检查：观看进度变化或距上次检查超过重新检查间隔
+        """
+        if time.time() - record.get("progress_time", 0) >= self._progress_recheck_interval:
+            return True
+        season_range = self.__progress_seasons(access_token, item.get("show"))
+        if not season_range:
+            # 获取进度失败时交给同步流程进入重试
+            return True
+        return season_range[0] != record.get("progress_begin")
+
+    @staticmethod
+    def __item_title(item: dict) -> str:
+        s_type = "movie" if item.get("type") == "movie" else "show"
+        return (item.get(s_type) or {}).get("title")
+
+    def __add_retry(self, retries: dict, key: str, item: dict, give_up: bool = True):
+        """
+        将同步失败的条目加入重试队列，按指数退避计算下次重试时间
+        :param give_up: 达到最大重试次数后是否放弃
+        """
+        attempts = retries.get(key, {}).get("attempts", 0) + 1
+        title = self.__item_title(item)
+        if give_up and attempts >= self._retry_max_attempts:
+            logger.error(f'{title} 已重试{attempts}次仍然失败，放弃同步')
+            retries[key] = {
+                "item": item,
+                "title": title,
+                "attempts": attempts,
+                "given_up": True
+            }
+            return
+        interval = min(self._retry_base_interval * 2 ** (attempts - 1), self._retry_max_interval)
+        logger.info(f'{title} 第{attempts}次同步失败，{interval}秒后重试')
+        retries[key] = {
+            "item": item,
+            "title": title,
+            "attempts": attempts,
+            "next_time": time.time() + interval
+        }
+
+    def __sync_item(self, item: dict, access_token: str,
+                    new_subscribes: list = None) -> Tuple[bool, Optional[dict]]:
+        """
+        同步单个watch list条目，新增的订阅追加到new_subscribes
+        :return: 是否成功，历史记录（无需记录时为None）
+        """
+        not_in_no_exists = True
+        season_range = None
+        s_type = "movie"
+        if item.get("type") != "movie":
+            s_type = "show"
+        else:
             s_type = "movie"
-            if item.get("type") != "movie":
-                s_type = "show"
-            else:
-                s_type = "movie"
-            trakt_media_info = item.get(s_type)
-            if str(item.get("id")) in history.keys():
-                logger.info(f'{trakt_media_info.get("title")} 已经同步过，直接跳过')
-                continue
-            meta = MetaInfo(title=trakt_media_info.get("title"))
-            meta.type = MediaType.MOVIE if s_type == "movie" else MediaType.TV
-            if trakt_media_info.get("ids").get("tmdb") is not None:
-                mediainfo = self.chain.recognize_media(meta=meta, tmdbid=trakt_media_info.get("ids").get("tmdb"))
-                exist_flag, no_exists = self.downloadchain.get_no_exists_info(meta=meta, mediainfo=mediainfo)
+        trakt_media_info = item.get(s_type)
+        meta = MetaInfo(title=trakt_media_info.get("title"))
+        meta.type = MediaType.MOVIE if s_type == "movie" else MediaType.TV
+        if trakt_media_info.get("ids").get("tmdb") is None:
+            logger.error(f'{meta.title} 没有TMDB ID')
+            return True, None
+        mediainfo = self.chain.recognize_media(meta=meta, tmdbid=trakt_media_info.get("ids").get("tmdb"))
+        if not mediainfo:
+            logger.error(f'{meta.title} 未识别到媒体信息')
+            return False, None
+        if self._watch_progress and item.get("type") == "show":
+            season_range = self.__progress_seasons(access_token, trakt_media_info)
+            if not season_range:
+                return False, None
+            logger.info(f'{mediainfo.title_year} 按观看进度从第{season_range[0]}季开始订阅')
+        exist_flag, no_exists = self.downloadchain.get_no_exists_info(meta=meta, mediainfo=mediainfo)
+        if exist_flag:
+            logger.info(f'{mediainfo.title_year}已经被订阅')
+            action = "exist"
+        else:
+            if meta.type == MediaType.MOVIE:
+                exist_flag = self.subscribechain.exists(mediainfo=mediainfo, meta=meta)
                 if exist_flag:
-                    logger.info(f'{mediainfo.title_year}已经被订阅')
-                    action = "exist"
-                else:
-                    if meta.type == MediaType.MOVIE:
+                    logger.info(f'{mediainfo.title_year} 已经订阅')
+                    return True, None
+                sub_id, message = self.add_subscribe_season(mediainfo, meta, "trakt", "trakt_sync")
+                if not sub_id:
+                    logger.error(f'{mediainfo.title_year} 添加订阅失败：{message}')
+                    return False, None
+                if new_subscribes is not None:
+                    new_subscribes.append((sub_id, mediainfo.tmdb_id, None))
+                subscribe = self.subscribechain.subscribeoper.get(sub_id)
+                if subscribe:
+                    self.subscribechain.finish_subscribe_or_not(subscribe=subscribe,
+                                                                meta=meta,
+                                                                mediainfo=mediainfo,
+                                                                downloads=[],
+                                                                lefts=no_exists)
+                logger.info(f'{mediainfo.title_year} 添加订阅成功')
+                action = "subscribe"
+            else:
+                for no_exist in no_exists.values():
+                    for season in no_exist.keys():
+                        if item.get("type") == "episode" and season != item.get("episode").get("season"):
+                            continue
+                        if item.get("type") == "season" and season != item.get("season").get("number"):
+                            continue
+                        if season_range and (season < season_range[0]
+                                             or (season_range[1] and season >= season_range[1])):
+                            continue
+                        meta.begin_season = season
                         exist_flag = self.subscribechain.exists(mediainfo=mediainfo, meta=meta)
                         if exist_flag:
-                            logger.info(f'{mediainfo.title_year} 已经订阅')
+                            logger.info(f'{mediainfo.title_year} 第{season}季 已经订阅')
                             action = "exist"
                             continue
                         sub_id, message = self.add_subscribe_season(mediainfo, meta, "trakt", "trakt_sync")
+                        if not sub_id:
+                            logger.error(f'{mediainfo.title_year} 第{season}季 添加订阅失败：{message}')
+                            return False, None
+                        if new_subscribes is not None:
+                            new_subscribes.append((sub_id, mediainfo.tmdb_id, season))
+                        # 更新订阅信息
+                        logger.info(f'根据缺失剧集更新订阅信息 {mediainfo.title_year} ...')
                         subscribe = self.subscribechain.subscribeoper.get(sub_id)
                         if subscribe:
                             self.subscribechain.finish_subscribe_or_not(subscribe=subscribe,
@@ -628,57 +1148,28 @@ class TraktSync(_PluginBase):
                                                                         lefts=no_exists)
                         logger.info(f'{mediainfo.title_year} 添加订阅成功')
                         action = "subscribe"
-                    else:
-                        for no_exist in no_exists.values():
-                            for season in no_exist.keys():
-                                if item.get("type") == "episode" and season != item.get("episode").get("season"):
-                                    continue
-                                if item.get("type") == "season" and season != item.get("season").get("number"):
-                                    continue
-                                meta.begin_season = season
-                                exist_flag = self.subscribechain.exists(mediainfo=mediainfo, meta=meta)
-                                if exist_flag:
-                                    logger.info(f'{mediainfo.title_year} 第{season}季 已经订阅')
-                                    action = "exist"
-                                    continue
-                                sub_id, message = self.add_subscribe_season(mediainfo, meta, "trakt", "trakt_sync")
-                                # 更新订阅信息
-                                logger.info(f'根据缺失剧集更新订阅信息 {mediainfo.title_year} ...')
-                                subscribe = self.subscribechain.subscribeoper.get(sub_id)
-                                if subscribe:
-                                    self.subscribechain.finish_subscribe_or_not(subscribe=subscribe,
-                                                                                meta=meta,
-                                                                                mediainfo=mediainfo,
-                                                                                downloads=[],
-                                                                                lefts=no_exists)
-                                logger.info(f'{mediainfo.title_year} 添加订阅成功')
-                                action = "subscribe"
-                                not_in_no_exists = False
-            else:
-                logger.error(f'{meta.title} 没有TMDB ID')
-                continue
-            if not_in_no_exists:
-                action = "exist"
-            if not history:
-                history = {}
-            tmp = {
-                "title": mediainfo.title_year,
-                "type": mediainfo.type.value,
-                "year": mediainfo.year,
-                "poster": mediainfo.get_poster_image(),
-                "overview": mediainfo.overview,
-                "tmdbid": mediainfo.tmdb_id,
-                "action": action,
-                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            if item.get("type") == "episode":
-                tmp["season"] = item.get("episode").get("season")
-            if item.get("type") == "season":
-                tmp["season"] = item.get("season").get("number")
+                        not_in_no_exists = False
+        if not_in_no_exists:
+            action = "exist"
+        record = {
+            "title": mediainfo.title_year,
+            "type": mediainfo.type.value,
+            "year": mediainfo.year,
+            "poster": mediainfo.get_poster_image(),
+            "overview": mediainfo.overview,
+            "tmdbid": mediainfo.tmdb_id,
+            "action": action,
+            "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        if item.get("type") == "episode":
+            record["season"] = item.get("episode").get("season")
+        if item.get("type") == "season":
+            record["season"] = item.get("season").get("number")
+        if season_range:
+            record["progress_begin"] = season_range[0]
+            record["progress_time"] = time.time()
+        return True, record
 
-            history[item.get("id")] = tmp
-        self.save_data("history", history)
-    
     def add_subscribe_season(self, mediainfo, meta, nickname, real_name):
         return self.subscribechain.add(
             title=mediainfo.title,
@@ -712,8 +1203,20 @@ class TraktSync(_PluginBase):
         }]
         """
         logger.info(f"Trakt Sync Plugin service registering")
-        if self._enabled and self._cron:
-            return [
+        services = []
+        if self._enabled and self._calendar:
+            # 按日历检查新剧集时无需频繁轮询watch list
+            services.append(
+                {
+                    "id": "TraktSync",
+                    "name": "Trakt Watchlist Sync",
+                    "trigger": "interval",
+                    "func": self.sync_watchlist,
+                    "kwargs": {"hours": self._calendar_sync_interval}
+                }
+            )
+        elif self._enabled and self._cron:
+            services.append(
                 {
                     "id": "TraktSync",
                     "name": "Trakt Watchlist Sync",
@@ -721,9 +1224,9 @@ class TraktSync(_PluginBase):
                     "func": self.sync_watchlist,
                     "kwargs": {}
                 }
-            ]
+            )
         elif self._enabled:
-            return [
+            services.append(
                 {
                     "id": "TraktSync",
                     "name": "Trakt Watchlist Sync",
@@ -731,8 +1234,18 @@ class TraktSync(_PluginBase):
                     "func": self.sync_watchlist,
                     "kwargs": {"minutes": 30}
                 }
-            ]
-        return []
+            )
+        if self._enabled and self._calendar:
+            services.append(
+                {
+                    "id": "TraktSyncCalendar",
+                    "name": "Trakt Calendar Refresh",
+                    "trigger": "interval",
+                    "func": self.refresh_calendar,
+                    "kwargs": {"hours": 12}
+                }
+            )
+        return services
     
     def stop_service(self):
         """
@@ -744,6 +1257,9 @@ class TraktSync(_PluginBase):
                 if self._scheduler.running:
                     self._scheduler.shutdown()
                 self._scheduler = None
+            if self._search_executor:
+                self._search_executor.shutdown(wait=False, cancel_futures=True)
+                self._search_executor = None
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e))
 